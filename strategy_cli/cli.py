@@ -1,21 +1,35 @@
 from __future__ import annotations
 
 import argparse
-import ast
+import os
 import re
-import subprocess
 import sys
-import tomllib
+from contextlib import closing
+from functools import lru_cache
 from pathlib import Path
-from textwrap import dedent
-from typing import Iterable, List
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
 
 DEFAULT_PACKAGE = "strategy_pack"
 DEFAULT_ENTRYPOINT_GROUP = "trading_system.strategies"
 
+_SOURCE_CHOICES = ("auto", "local_csv", "local_parquet", "http_csv", "synthetic")
+
+_TOML_CACHE: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+_SNAKE_RE = re.compile(r"[^a-zA-Z0-9]+")
+_SNAKE_TABLE = str.maketrans(
+    {chr(code): "_" for code in range(128) if not chr(code).isalnum()}
+)
+
 
 def snake_case(name: str) -> str:
-    normalized = re.sub(r"[^a-zA-Z0-9]+", "_", name).strip("_").lower()
+    if name.isascii():
+        normalized = name.translate(_SNAKE_TABLE)
+        while "__" in normalized:
+            normalized = normalized.replace("__", "_")
+        normalized = normalized.strip("_").lower()
+    else:
+        normalized = _SNAKE_RE.sub("_", name).strip("_").lower()
     if not normalized:
         raise ValueError("strategy name must include alphanumeric characters")
     if normalized[0].isdigit():
@@ -27,9 +41,12 @@ def pascal_case(name: str) -> str:
     return "".join(part.capitalize() for part in snake_case(name).split("_"))
 
 
-def strategy_template(class_name: str) -> str:
+@lru_cache(maxsize=None)
+def _strategy_template_body() -> str:
+    from textwrap import dedent
+
     return dedent(
-        f"""
+        """
         from __future__ import annotations
 
         from typing import Any, Dict
@@ -38,9 +55,9 @@ def strategy_template(class_name: str) -> str:
         from trading_sdk.structs import AccountSnapshot, OrderSignal
 
 
-        class {class_name}(BaseStrategy):
+        class __CLASS__(BaseStrategy):
             def default_params(self) -> Dict[str, Any]:
-                return {{"risk_pct": 0.01, "min_qty": 0.0}}
+                return {"risk_pct": 0.01, "min_qty": 0.0}
 
             def next_signal(self, market_data: Any, account_data: Any) -> OrderSignal:
                 if market_data is None or "Close" not in market_data.columns:
@@ -93,27 +110,42 @@ def strategy_template(class_name: str) -> str:
     ).strip() + "\n"
 
 
-def strategy_test_template(module_name: str, class_name: str) -> str:
+def strategy_template(class_name: str) -> str:
+    return _strategy_template_body().replace("__CLASS__", class_name)
+
+
+@lru_cache(maxsize=None)
+def _strategy_test_template_body() -> str:
+    from textwrap import dedent
+
     return dedent(
-        f"""
+        """
         from __future__ import annotations
 
         import pandas as pd
 
-        from {DEFAULT_PACKAGE}.strategies.{module_name} import {class_name}
+        from __PACKAGE__.strategies.__MODULE__ import __CLASS__
 
 
         def test_strategy_returns_order_signal() -> None:
-            strategy = {class_name}(params={{"risk_pct": 0.01}})
-            strategy.setup({{"backtest": {{"fee_rate": 0.001}}}})
-            market = pd.DataFrame({{"Close": [100.0, 101.0]}})
+            strategy = __CLASS__(params={"risk_pct": 0.01})
+            strategy.setup({"backtest": {"fee_rate": 0.001}})
+            market = pd.DataFrame({"Close": [100.0, 101.0]})
             signal = strategy.next_signal(
                 market,
-                {{"balance": 1000.0, "cash": 1000.0}},
+                {"balance": 1000.0, "cash": 1000.0},
             )
-            assert signal.action in {{"BUY", "SELL", "WAIT"}}
+            assert signal.action in {"BUY", "SELL", "WAIT"}
         """
-    ).strip() + "\n"
+    ).strip().replace("__PACKAGE__", DEFAULT_PACKAGE) + "\n"
+
+
+def strategy_test_template(module_name: str, class_name: str) -> str:
+    return (
+        _strategy_test_template_body()
+        .replace("__MODULE__", module_name)
+        .replace("__CLASS__", class_name)
+    )
 
 
 def ensure_init_file(path: Path) -> None:
@@ -158,57 +190,29 @@ def cmd_new(args: argparse.Namespace) -> int:
     return 0
 
 
-def _parse_import_violations(path: Path) -> List[str]:
-    source = path.read_text(encoding="utf-8")
-    tree = ast.parse(source, filename=str(path))
-    violations: List[str] = []
-
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                if alias.name == "ccxt" or alias.name.startswith("ccxt."):
-                    violations.append(f"{path}: forbidden import '{alias.name}'")
-                if alias.name.startswith("core"):
-                    violations.append(f"{path}: engine dependency import '{alias.name}'")
-        elif isinstance(node, ast.ImportFrom):
-            module = node.module or ""
-            if module == "ccxt" or module.startswith("ccxt."):
-                violations.append(f"{path}: forbidden import from '{module}'")
-            if module == "core" or module.startswith("core."):
-                violations.append(f"{path}: engine dependency import from '{module}'")
+def _load_pyproject(pyproject: Path) -> Dict[str, Any]:
+    # Callers only read the parsed data, so sharing it between calls is safe.
+    # One entry per file, replaced when its mtime changes.
+    key = str(pyproject)
+    mtime_ns = pyproject.stat().st_mtime_ns
+    cached = _TOML_CACHE.get(key)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
 
-    return violations
+    import tomllib
 
-
-def _parse_strategy_classes(path: Path) -> List[str]:
-    source = path.read_text(encoding="utf-8")
-    tree = ast.parse(source, filename=str(path))
-    issues: List[str] = []
-
-    for node in tree.body:
-        if not isinstance(node, ast.ClassDef):
-            continue
-        base_names = []
-        for base in node.bases:
-            if isinstance(base, ast.Name):
-                base_names.append(base.id)
-            elif isinstance(base, ast.Attribute):
-                base_names.append(base.attr)
-        if "BaseStrategy" not in base_names:
-            continue
-        method_names = {item.name for item in node.body if isinstance(item, ast.FunctionDef)}
-        if "next_signal" not in method_names:
-            issues.append(f"{path}: {node.name} must define next_signal")
-    return issues
+    data = tomllib.loads(pyproject.read_text(encoding="utf-8"))
+    _TOML_CACHE[key] = (mtime_ns, data)
+    return data
 
 
-def _validate_pyproject(path: Path, package: str) -> List[str]:
+def _validate_pyproject(path: Path, package: str, package_files: Sequence[Path]) -> List[str]:
     issues: List[str] = []
     pyproject = path / "pyproject.toml"
     if not pyproject.exists():
         return [f"{pyproject}: missing"]
 
-    data = tomllib.loads(pyproject.read_text(encoding="utf-8"))
+    data = _load_pyproject(pyproject)
     project = data.get("project", {})
     dependencies = project.get("dependencies", [])
     if not any(str(dep).startswith("trading-sdk") for dep in dependencies):
@@ -221,13 +225,20 @@ def _validate_pyproject(path: Path, package: str) -> List[str]:
             f"{pyproject}: entrypoint group '{DEFAULT_ENTRYPOINT_GROUP}' has no registrations"
         )
     else:
+        # Modules are first looked up among the files already collected for
+        # validation; a miss still falls back to a stat, since rglob does not
+        # follow symlinked directories and may differ in case from the target.
+        package_modules = {
+            file.relative_to(path).with_suffix("").as_posix().replace("/", ".")
+            for file in package_files
+        }
         for name, target in group.items():
             if ":" not in str(target):
                 issues.append(f"{pyproject}: invalid entrypoint target for '{name}'")
                 continue
             module_name = str(target).split(":", 1)[0]
             module_path = path / (module_name.replace(".", "/") + ".py")
-            if not module_path.exists():
+            if module_name not in package_modules and not module_path.exists():
                 issues.append(f"{pyproject}: entrypoint module not found '{module_path}'")
             if not module_name.startswith(package):
                 issues.append(
@@ -237,6 +248,14 @@ def _validate_pyproject(path: Path, package: str) -> List[str]:
     return issues
 
 
+def _iter_validation_issues(root: Path, package: str) -> Iterator[str]:
+    from .validation import CACHE_DIR, iter_issues
+
+    paths = list((root / package).rglob("*.py"))
+    yield from iter_issues(paths, cache_dir=root / CACHE_DIR)
+    yield from _validate_pyproject(root, package, paths)
+
+
 def cmd_validate(args: argparse.Namespace) -> int:
     root = Path(args.path).resolve()
     package_dir = root / args.package
@@ -244,27 +263,46 @@ def cmd_validate(args: argparse.Namespace) -> int:
         print(f"package directory not found: {package_dir}", file=sys.stderr)
         return 1
 
-    issues: List[str] = []
-    for path in package_dir.rglob("*.py"):
-        issues.extend(_parse_import_violations(path))
-        issues.extend(_parse_strategy_classes(path))
-
-    issues.extend(_validate_pyproject(root, args.package))
-
-    if issues:
-        print("validation failed:")
+    failed = False
+    with closing(_iter_validation_issues(root, args.package)) as issues:
         for issue in issues:
+            if not failed:
+                print("validation failed:")
+                failed = True
             print(f"- {issue}")
+            if getattr(args, "fail_fast", False):
+                break
+
+    if failed:
         return 1
 
     print("validation passed")
     return 0
 
 
+def _run_command(command: List[str], cwd: Path) -> int:
+    # Nothing runs after the child exits, so hand the process over to it on
+    # POSIX instead of forking and waiting.
+    if sys.platform == "win32":
+        import subprocess
+
+        return subprocess.run(command, cwd=cwd, check=False).returncode
+
+    sys.stdout.flush()
+    sys.stderr.flush()
+    previous_cwd = os.getcwd()
+    os.chdir(cwd)
+    try:
+        os.execvp(command[0], command)
+    except OSError:
+        os.chdir(previous_cwd)
+        raise
+
+
 def cmd_test(args: argparse.Namespace) -> int:
     root = Path(args.path).resolve()
     cmd = [sys.executable, "-m", "pytest", *args.pytest_args]
-    return subprocess.run(cmd, cwd=root, check=False).returncode
+    return _run_command(cmd, root)
 
 
 def cmd_backtest(args: argparse.Namespace) -> int:
@@ -281,53 +319,88 @@ def cmd_backtest(args: argparse.Namespace) -> int:
     ]
     if args.strategy:
         command.extend(["--strategy", args.strategy])
-    return subprocess.run(command, cwd=engine_root, check=False).returncode
+    return _run_command(command, engine_root)
+
+
+def _configure_new(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("name", help="strategy name (snake case or free text)")
+    parser.add_argument("--path", default=".", help="strategy-pack root")
+    parser.add_argument("--package", default=DEFAULT_PACKAGE, help="python package name")
+    parser.add_argument("--class-name", dest="class_name", default=None)
+    parser.add_argument("--force", action="store_true", help="overwrite existing files")
+    parser.set_defaults(func=cmd_new)
+
+
+def _configure_validate(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--path", default=".", help="strategy-pack root")
+    parser.add_argument("--package", default=DEFAULT_PACKAGE, help="python package name")
+    parser.add_argument(
+        "--fail-fast",
+        dest="fail_fast",
+        action="store_true",
+        help="stop at the first issue",
+    )
+    parser.set_defaults(func=cmd_validate)
 
 
-def build_parser() -> argparse.ArgumentParser:
-    parser = argparse.ArgumentParser(description="Strategy Pack development CLI")
-    subparsers = parser.add_subparsers(dest="command", required=True)
+def _configure_test(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--path", default=".", help="strategy-pack root")
+    parser.add_argument("pytest_args", nargs=argparse.REMAINDER)
+    parser.set_defaults(func=cmd_test)
+
 
-    new_parser = subparsers.add_parser("new", help="create strategy and test templates")
-    new_parser.add_argument("name", help="strategy name (snake case or free text)")
-    new_parser.add_argument("--path", default=".", help="strategy-pack root")
-    new_parser.add_argument("--package", default=DEFAULT_PACKAGE, help="python package name")
-    new_parser.add_argument("--class-name", dest="class_name", default=None)
-    new_parser.add_argument("--force", action="store_true", help="overwrite existing files")
-    new_parser.set_defaults(func=cmd_new)
-
-    validate_parser = subparsers.add_parser("validate", help="validate strategy-pack constraints")
-    validate_parser.add_argument("--path", default=".", help="strategy-pack root")
-    validate_parser.add_argument("--package", default=DEFAULT_PACKAGE, help="python package name")
-    validate_parser.set_defaults(func=cmd_validate)
-
-    test_parser = subparsers.add_parser("test", help="run strategy-pack tests")
-    test_parser.add_argument("--path", default=".", help="strategy-pack root")
-    test_parser.add_argument("pytest_args", nargs=argparse.REMAINDER)
-    test_parser.set_defaults(func=cmd_test)
-
-    backtest_parser = subparsers.add_parser("backtest", help="run engine backtest command")
-    backtest_parser.add_argument("--engine-root", default="..", help="engine repository root")
-    backtest_parser.add_argument(
+def _configure_backtest(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--engine-root", default="..", help="engine repository root")
+    parser.add_argument(
         "--config",
         default="configs/default.yaml",
         help="engine config path",
     )
-    backtest_parser.add_argument(
+    parser.add_argument(
         "--source",
         default="synthetic",
-        choices=["auto", "local_csv", "local_parquet", "http_csv", "synthetic"],
+        choices=_SOURCE_CHOICES,
     )
-    backtest_parser.add_argument("--rows", type=int, default=500)
-    backtest_parser.add_argument("--strategy", default=None)
-    backtest_parser.set_defaults(func=cmd_backtest)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--strategy", default=None)
+    parser.set_defaults(func=cmd_backtest)
+
+
+_COMMANDS: Dict[str, Tuple[str, Callable[[argparse.ArgumentParser], None]]] = {
+    "new": ("create strategy and test templates", _configure_new),
+    "validate": ("validate strategy-pack constraints", _configure_validate),
+    "test": ("run strategy-pack tests", _configure_test),
+    "backtest": ("run engine backtest command", _configure_backtest),
+}
+
+
+def _selected_command(argv: Sequence[str]) -> str | None:
+    # Only the leading token can name the subcommand; flags such as -h mean
+    # every subparser must be fully configured for the help output.
+    if argv and argv[0] in _COMMANDS:
+        return argv[0]
+    return None
+
+
+def build_parser(argv: Sequence[str] | None = None) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Strategy Pack development CLI")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    # Without argv every subparser is configured; main() passes its argv so
+    # that only the requested command pays for its arguments.
+    selected = None if argv is None else _selected_command(argv)
+    for name, (help_text, configure) in _COMMANDS.items():
+        command_parser = subparsers.add_parser(name, help=help_text)
+        if selected is None or selected == name:
+            configure(command_parser)
 
     return parser
 
 
 def main(argv: Iterable[str] | None = None) -> int:
-    parser = build_parser()
-    args = parser.parse_args(list(argv) if argv is not None else None)
+    argv_list = list(argv) if argv is not None else sys.argv[1:]
+    parser = build_parser(argv_list)
+    args = parser.parse_args(argv_list)
     return args.func(args)
 
 
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+import marshal
+import multiprocessing
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Iterator, List, Sequence
+
+CACHE_DIR = Path(".strategy_cli_cache") / "validate"
+
+_FORBIDDEN_EXACT = frozenset({"ccxt"})
+_FORBIDDEN_PREFIX = ("ccxt.",)
+_ENGINE_EXACT = frozenset({"core"})
+_ENGINE_PREFIX = ("core.",)
+# Plain ``import`` statements have always been matched on the bare prefix.
+_ENGINE_IMPORT_PREFIX = ("core",)
+# In pure ASCII source without a coding cookie, any import the rules above can
+# flag has to spell one of these names, so a source without a match cannot
+# produce an import violation. Other sources may spell identifiers through
+# NFKC normalization or a non-UTF-8 codec and are always parsed.
+_CODING_RE = re.compile(rb"^[ \t\f]*#.*?coding[:=]")
+_LINE_BREAK_RE = re.compile(rb"\r\n?|\n")
+_IMPORT_SCREEN_RE = re.compile(rb"\b(?:ccxt|core)")
+# A forked pool costs ~5 ms to start, while a template-sized strategy validates
+# in ~0.3 ms uncached, so fewer cache misses than this stay serial. Spawned
+# pools (macOS, Windows) cost 100-150 ms and are never used.
+_PARALLEL_MIN_FILES = 64
+_POOL_CHUNKSIZE = 4
+
+
+class _Validator(ast.NodeVisitor):
+    def __init__(self, path: Path, check_imports: bool = True) -> None:
+        self.path = path
+        self.check_imports = check_imports
+        self.violations: List[str] = []
+        self.issues: List[str] = []
+
+    def visit_Module(self, node: ast.Module) -> None:
+        # Only top-level classes are strategy candidates; nested classes are
+        # still walked below so their imports get checked.
+        for item in node.body:
+            if isinstance(item, ast.ClassDef):
+                self._check_strategy_class(item)
+        if self.check_imports:
+            self.generic_visit(node)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            name = alias.name
+            if name in _FORBIDDEN_EXACT or name.startswith(_FORBIDDEN_PREFIX):
+                self.violations.append(f"{self.path}: forbidden import '{name}'")
+            if name.startswith(_ENGINE_IMPORT_PREFIX):
+                self.violations.append(f"{self.path}: engine dependency import '{name}'")
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        module = node.module or ""
+        if module in _FORBIDDEN_EXACT or module.startswith(_FORBIDDEN_PREFIX):
+            self.violations.append(f"{self.path}: forbidden import from '{module}'")
+        if module in _ENGINE_EXACT or module.startswith(_ENGINE_PREFIX):
+            self.violations.append(f"{self.path}: engine dependency import from '{module}'")
+
+    def _check_strategy_class(self, node: ast.ClassDef) -> None:
+        is_strategy = any(
+            (isinstance(base, ast.Name) and base.id == "BaseStrategy")
+            or (isinstance(base, ast.Attribute) and base.attr == "BaseStrategy")
+            for base in node.bases
+        )
+        if not is_strategy:
+            return
+        has_next_signal = any(
+            isinstance(item, ast.FunctionDef) and item.name == "next_signal"
+            for item in node.body
+        )
+        if not has_next_signal:
+            self.issues.append(f"{self.path}: {node.name} must define next_signal")
+
+
+def parse_source(path: Path, source: bytes) -> ast.Module:
+    # Equivalent to ast.parse, minus its wrapper and the inherited
+    # __future__ flags of this module.
+    return compile(
+        source,
+        str(path),
+        "exec",
+        flags=ast.PyCF_ONLY_AST,
+        dont_inherit=True,
+        optimize=-1,
+    )
+
+
+def validate_tree(path: Path, tree: ast.Module, check_imports: bool = True) -> List[str]:
+    validator = _Validator(path, check_imports)
+    validator.visit(tree)
+    return validator.violations + validator.issues
+
+
+def _can_screen(source: bytes) -> bool:
+    if not source.isascii():
+        return False
+    head = _LINE_BREAK_RE.split(source, maxsplit=2)[:2]
+    return not any(_CODING_RE.match(line) for line in head)
+
+
+def validate_source(path: Path, source: bytes) -> List[str]:
+    # Every module is parsed so that one that does not compile always fails
+    # validation; the screen only decides whether the import walk is needed.
+    try:
+        tree = parse_source(path, source)
+    except (SyntaxError, ValueError) as exc:
+        line = getattr(exc, "lineno", None)
+        location = f" (line {line})" if line else ""
+        return [f"{path}: syntax error: {getattr(exc, 'msg', exc)}{location}"]
+    check_imports = not _can_screen(source) or _IMPORT_SCREEN_RE.search(source) is not None
+    return validate_tree(path, tree, check_imports)
+
+
+@lru_cache(maxsize=None)
+def _cache_version() -> str | None:
+    # Cached results depend on these rules and on the parser, so entries are
+    # filed under a digest of this module's source and the Python version.
+    # Without a readable source (zip or wheel imports) caching is disabled.
+    try:
+        source = Path(__file__).read_bytes()
+    except OSError:
+        return None
+    digest = hashlib.blake2b(sys.version.encode(), digest_size=8)
+    digest.update(source)
+    return digest.hexdigest()
+
+
+def _cache_file(data: bytes, cache_dir: Path, version: str) -> Path:
+    key = hashlib.blake2b(data, digest_size=16).hexdigest()
+    return cache_dir / version / key[:2] / f"{key}.m"
+
+
+def validate_file(path: Path, cache_dir: Path | None = None) -> List[str]:
+    data = path.read_bytes()
+    version = _cache_version()
+    if cache_dir is None or version is None:
+        return validate_source(path, data)
+
+    cache_file = _cache_file(data, cache_dir, version)
+    issues = _read_cache(path, cache_file)
+    if issues is not None:
+        return issues
+
+    issues = validate_source(path, data)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_bytes(marshal.dumps([issue[len(f"{path}: "):] for issue in issues]))
+    except OSError:
+        pass
+    return issues
+
+
+def _read_cache(path: Path, cache_file: Path) -> List[str] | None:
+    # Entries are keyed on content alone so they survive fresh checkouts;
+    # the path prefix is stripped before storing and restored on load.
+    prefix = f"{path}: "
+    try:
+        return [prefix + message for message in marshal.loads(cache_file.read_bytes())]
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def _cached_issues(path: Path, cache_dir: Path | None) -> List[str] | None:
+    version = _cache_version()
+    if cache_dir is None or version is None:
+        return None
+    return _read_cache(path, _cache_file(path.read_bytes(), cache_dir, version))
+
+
+def _can_use_pool() -> bool:
+    return (os.cpu_count() or 1) > 1 and multiprocessing.get_start_method() == "fork"
+
+
+def iter_issues(paths: Sequence[Path], cache_dir: Path | None = None) -> Iterator[str]:
+    validate = partial(validate_file, cache_dir=cache_dir)
+    if len(paths) < _PARALLEL_MIN_FILES or not _can_use_pool():
+        for path in paths:
+            yield from validate(path)
+        return
+
+    # Cache hits cost less than handing them to a worker, so they are resolved
+    # here and only the misses are considered for the pool.
+    cached = [_cached_issues(path, cache_dir) for path in paths]
+    misses = [path for path, issues in zip(paths, cached) if issues is None]
+    if len(misses) < _PARALLEL_MIN_FILES:
+        for path, issues in zip(paths, cached):
+            yield from issues if issues is not None else validate(path)
+        return
+
+    workers = min(os.cpu_count() or 1, -(-len(misses) // _POOL_CHUNKSIZE))
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        fresh = executor.map(validate, misses, chunksize=_POOL_CHUNKSIZE)
+        for issues in cached:
+            yield from issues if issues is not None else next(fresh)
+    finally:
+        # Closing the generator early (fail-fast) drops files not yet started.
+        executor.shutdown(cancel_futures=True)
@@ -2,19 +2,53 @@
 
 from __future__ import annotations
 
+import os
 import sys
 from argparse import Namespace
 from pathlib import Path
 
+import pytest
+
 CLI_ROOT = Path(__file__).resolve().parents[1]
 if str(CLI_ROOT) not in sys.path:
     sys.path.insert(0, str(CLI_ROOT))
 
-from strategy_cli.cli import cmd_new, cmd_validate, snake_case
+from strategy_cli.cli import (
+    _TOML_CACHE,
+    _load_pyproject,
+    _run_command,
+    build_parser,
+    cmd_backtest,
+    cmd_new,
+    cmd_test,
+    cmd_validate,
+    snake_case,
+)
 
 
 def test_snake_case_normalizes_text() -> None:
     assert snake_case("My Strategy") == "my_strategy"
+    assert snake_case("--Mean__Reversion  v2!") == "mean_reversion_v2"
+    assert snake_case("momentum 戦略 v2") == "momentum_v2"
+
+
+def test_build_parser_configures_only_selected_command() -> None:
+    parser = build_parser(["backtest", "--rows", "10"])
+
+    args = parser.parse_args(["backtest", "--rows", "10"])
+
+    assert args.rows == 10
+    assert args.source == "synthetic"
+    assert not hasattr(parser.parse_args(["new"]), "func")
+
+
+def test_build_parser_without_argv_configures_every_command() -> None:
+    parser = build_parser()
+
+    assert parser.parse_args(["new", "x"]).func is cmd_new
+    assert parser.parse_args(["validate", "--path", "."]).func is cmd_validate
+    assert parser.parse_args(["test", "--path", "."]).func is cmd_test
+    assert parser.parse_args(["backtest", "--rows", "5"]).func is cmd_backtest
 
 
 def test_cmd_new_creates_strategy_and_test_files(tmp_path: Path) -> None:
@@ -100,3 +134,143 @@ def test_cmd_validate_passes_for_valid_package(tmp_path: Path) -> None:
     code = cmd_validate(args)
 
     assert code == 0
+
+
+def test_cmd_validate_fail_fast_reports_only_first_issue(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    package_dir = tmp_path / "strategy_pack"
+    package_dir.mkdir()
+    (package_dir / "bad.py").write_text("import ccxt\nimport core\n", encoding="utf-8")
+
+    args = Namespace(path=str(tmp_path), package="strategy_pack", fail_fast=True)
+
+    code = cmd_validate(args)
+
+    assert code == 1
+    assert capsys.readouterr().out.splitlines() == [
+        "validation failed:",
+        f"- {package_dir / 'bad.py'}: forbidden import 'ccxt'",
+    ]
+
+
+def test_cmd_validate_reports_missing_entrypoint_module(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    package_dir = tmp_path / "strategy_pack" / "strategies"
+    package_dir.mkdir(parents=True)
+    (package_dir / "ok.py").write_text("", encoding="utf-8")
+    (tmp_path / "pyproject.toml").write_text(
+        "[project]\n"
+        "name='strategy-pack'\n"
+        "version='0.1.0'\n"
+        "dependencies=['trading-sdk>=0.1.0']\n"
+        "[project.entry-points.\"trading_system.strategies\"]\n"
+        "ok='strategy_pack.strategies.ok:OkStrategy'\n"
+        "gone='strategy_pack.strategies.gone:GoneStrategy'\n",
+        encoding="utf-8",
+    )
+
+    args = Namespace(path=str(tmp_path), package="strategy_pack")
+
+    code = cmd_validate(args)
+
+    missing = tmp_path / "strategy_pack" / "strategies" / "gone.py"
+    assert code == 1
+    assert capsys.readouterr().out.splitlines() == [
+        "validation failed:",
+        f"- {tmp_path / 'pyproject.toml'}: entrypoint module not found '{missing}'",
+    ]
+
+
+def test_run_command_execs_in_target_directory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls = []
+    monkeypatch.setattr(sys, "platform", "linux")
+    monkeypatch.setattr(os, "chdir", lambda path: calls.append(("chdir", path)))
+    monkeypatch.setattr(os, "execvp", lambda file, args: calls.append(("execvp", file, args)))
+
+    _run_command(["python", "-m", "pytest"], tmp_path)
+
+    assert calls == [
+        ("chdir", tmp_path),
+        ("execvp", "python", ["python", "-m", "pytest"]),
+    ]
+
+
+def test_run_command_restores_cwd_when_exec_fails(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    target = tmp_path / "engine"
+    target.mkdir()
+
+    def fail_exec(file: str, args: list) -> None:
+        raise FileNotFoundError(file)
+
+    monkeypatch.setattr(sys, "platform", "linux")
+    monkeypatch.setattr(os, "execvp", fail_exec)
+
+    with pytest.raises(FileNotFoundError):
+        _run_command(["missing-binary"], target)
+
+    assert Path.cwd() == tmp_path
+
+
+def test_run_command_falls_back_to_subprocess_on_windows(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(sys, "platform", "win32")
+    script = "import os, sys; sys.exit(3 if os.getcwd() == sys.argv[1] else 1)"
+    command = [sys.executable, "-c", script, os.path.realpath(tmp_path)]
+
+    assert _run_command(command, tmp_path) == 3
+
+
+def test_load_pyproject_replaces_entry_when_file_changes(tmp_path: Path) -> None:
+    pyproject = tmp_path / "pyproject.toml"
+    pyproject.write_text("[project]\nname='a'\n", encoding="utf-8")
+    assert _load_pyproject(pyproject)["project"]["name"] == "a"
+
+    pyproject.write_text("[project]\nname='b'\n", encoding="utf-8")
+    os.utime(pyproject, ns=(0, pyproject.stat().st_mtime_ns + 1))
+
+    assert _load_pyproject(pyproject)["project"]["name"] == "b"
+    assert [key for key in _TOML_CACHE if key.startswith(str(tmp_path))] == [str(pyproject)]
+    assert _TOML_CACHE[str(pyproject)][0] == pyproject.stat().st_mtime_ns
+
+
+def test_cmd_validate_fails_for_module_that_does_not_compile(tmp_path: Path) -> None:
+    package_dir = tmp_path / "strategy_pack"
+    package_dir.mkdir()
+    (package_dir / "broken.py").write_text("def broken(:\n", encoding="utf-8")
+
+    args = Namespace(path=str(tmp_path), package="strategy_pack", fail_fast=True)
+
+    code = cmd_validate(args)
+
+    assert code == 1
+
+
+def test_cmd_validate_finds_entrypoint_through_symlinked_directory(tmp_path: Path) -> None:
+    real_dir = tmp_path / "real"
+    real_dir.mkdir()
+    (real_dir / "foo.py").write_text("", encoding="utf-8")
+    package_dir = tmp_path / "strategy_pack"
+    package_dir.mkdir()
+    (package_dir / "strategies").symlink_to(real_dir, target_is_directory=True)
+    (tmp_path / "pyproject.toml").write_text(
+        "[project]\n"
+        "name='strategy-pack'\n"
+        "version='0.1.0'\n"
+        "dependencies=['trading-sdk>=0.1.0']\n"
+        "[project.entry-points.\"trading_system.strategies\"]\n"
+        "foo='strategy_pack.strategies.foo:FooStrategy'\n",
+        encoding="utf-8",
+    )
+
+    args = Namespace(path=str(tmp_path), package="strategy_pack")
+
+    assert cmd_validate(args) == 0
+
@@ -0,0 +1,191 @@
+# ruff: noqa: E402
+
+from __future__ import annotations
+
+import marshal
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+CLI_ROOT = Path(__file__).resolve().parents[1]
+if str(CLI_ROOT) not in sys.path:
+    sys.path.insert(0, str(CLI_ROOT))
+
+from strategy_cli import validation
+from strategy_cli.validation import iter_issues, validate_file, validate_source
+
+
+def test_validate_source_checks_nested_imports_and_top_level_classes() -> None:
+    path = Path("mixed.py")
+    source = (
+        b"from trading_sdk.base_strategy import BaseStrategy\n"
+        b"def helper():\n"
+        b"    from core.engine import Engine\n"
+        b"    class Inner(BaseStrategy):\n"
+        b"        pass\n"
+        b"class Outer(BaseStrategy):\n"
+        b"    def run(self):\n"
+        b"        import ccxt\n"
+    )
+
+    issues = validate_source(path, source)
+
+    assert issues == [
+        f"{path}: engine dependency import from 'core.engine'",
+        f"{path}: forbidden import 'ccxt'",
+        f"{path}: Outer must define next_signal",
+    ]
+
+
+def test_iter_issues_keeps_file_order_in_parallel(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    paths = []
+    for index in range(70):
+        path = tmp_path / f"mod_{index}.py"
+        path.write_text("import ccxt\n" if index % 2 else "x = 1\n", encoding="utf-8")
+        paths.append(path)
+
+    issues = list(iter_issues(paths))
+
+    assert issues == [f"{path}: forbidden import 'ccxt'" for path in paths[1::2]]
+
+
+def test_validate_file_caches_by_content(tmp_path: Path) -> None:
+    path = tmp_path / "mod.py"
+    path.write_text("import ccxt\n", encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+
+    assert validate_file(path, cache_dir) == [f"{path}: forbidden import 'ccxt'"]
+    (cache_file,) = cache_dir.rglob("*.m")
+    cache_file.write_bytes(marshal.dumps(["cached"]))
+    assert validate_file(path, cache_dir) == [f"{path}: cached"]
+
+    copy = tmp_path / "copy.py"
+    copy.write_text("import ccxt\n", encoding="utf-8")
+    assert validate_file(copy, cache_dir) == [f"{copy}: cached"]
+
+    path.write_text("import ccxt.pro\n", encoding="utf-8")
+    assert validate_file(path, cache_dir) == [f"{path}: forbidden import 'ccxt.pro'"]
+
+
+def test_validate_file_ignores_cache_from_other_validator_versions(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "mod.py"
+    path.write_text("import ccxt\n", encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+    validate_file(path, cache_dir)
+    (cache_file,) = cache_dir.rglob("*.m")
+    cache_file.write_bytes(marshal.dumps(["stale"]))
+
+    monkeypatch.setattr(validation, "_cache_version", lambda: "next")
+
+    assert validate_file(path, cache_dir) == [f"{path}: forbidden import 'ccxt'"]
+
+
+def test_validate_source_screens_relative_engine_imports() -> None:
+    path = Path("rel.py")
+
+    assert validate_source(path, b"from .core import engine\n") == [
+        f"{path}: engine dependency import from 'core'"
+    ]
+    assert validate_source(path, b"import scores\n") == []
+
+
+def test_validate_source_parses_sources_the_screen_cannot_read() -> None:
+    path = Path("spoof.py")
+
+    assert validate_source(path, "import ｃｃｘｔ\n".encode()) == [
+        f"{path}: forbidden import 'ccxt'"
+    ]
+    assert validate_source(path, "from ｃｏｒｅ.x import y\n".encode()) == [
+        f"{path}: engine dependency import from 'core.x'"
+    ]
+    assert validate_source(path, b"# coding: utf-7\nimport +AGM-cxt\n") == [
+        f"{path}: forbidden import 'ccxt'"
+    ]
+
+
+def test_validate_source_reports_modules_that_do_not_compile() -> None:
+    path = Path("broken.py")
+
+    assert validate_source(path, b"def broken(:\n") == [
+        f"{path}: syntax error: invalid syntax (line 1)"
+    ]
+
+
+def test_validate_source_checks_strategy_classes_however_bases_are_spelled() -> None:
+    path = Path("plain.py")
+
+    assert validate_source(
+        path,
+        b"class S(\n    Generic[T], base.BaseStrategy, metaclass=make(Meta)\n):\n    pass\n",
+    ) == [f"{path}: S must define next_signal"]
+    assert validate_source(path, "class S(ＢaseStrategy):\n    pass\n".encode()) == [
+        f"{path}: S must define next_signal"
+    ]
+
+
+def test_iter_issues_stays_serial_on_single_cpu(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(os, "cpu_count", lambda: 1)
+    monkeypatch.setattr(validation, "ProcessPoolExecutor", None)
+    paths = []
+    for index in range(70):
+        path = tmp_path / f"mod_{index}.py"
+        path.write_text("x = 1\n", encoding="utf-8")
+        paths.append(path)
+
+    assert list(iter_issues(paths)) == []
+
+
+def test_iter_issues_resolves_cache_hits_without_a_pool(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    cache_dir = tmp_path / "cache"
+    paths = []
+    for index in range(70):
+        path = tmp_path / f"mod_{index}.py"
+        path.write_text(f"import ccxt  # {index}\n", encoding="utf-8")
+        validate_file(path, cache_dir)
+        paths.append(path)
+    monkeypatch.setattr(validation, "ProcessPoolExecutor", None)
+
+    issues = list(iter_issues(paths, cache_dir))
+
+    assert issues == [f"{path}: forbidden import 'ccxt'" for path in paths]
+
+
+def test_iter_issues_stays_serial_without_fork(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+    monkeypatch.setattr(multiprocessing, "get_start_method", lambda: "spawn")
+    monkeypatch.setattr(validation, "ProcessPoolExecutor", None)
+    paths = []
+    for index in range(70):
+        path = tmp_path / f"mod_{index}.py"
+        path.write_text("x = 1\n", encoding="utf-8")
+        paths.append(path)
+
+    assert list(iter_issues(paths, tmp_path / "cache")) == []
+
+
+def test_validate_file_skips_cache_when_version_is_unavailable(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "mod.py"
+    path.write_text("import ccxt\n", encoding="utf-8")
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(validation, "_cache_version", lambda: None)
+
+    assert validate_file(path, cache_dir) == [f"{path}: forbidden import 'ccxt'"]
+    assert not cache_dir.exists()
+